@@ -0,0 +1,99 @@
+from io import BytesIO
+from xml.sax.saxutils import escape
+import re
+import zipfile
+
+# Статические части DOCX-пакета: не меняются между запросами,
+# поэтому собираются один раз при импорте модуля
+STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+        '</Types>'
+    ).encode("utf-8"),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    ).encode("utf-8"),
+    "word/_rels/document.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ).encode("utf-8"),
+    "word/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        '<w:docDefaults><w:rPrDefault><w:rPr>'
+        '<w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:cs="Times New Roman"/>'
+        '<w:sz w:val="24"/><w:szCs w:val="24"/>'
+        '</w:rPr></w:rPrDefault></w:docDefaults>'
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/>'
+        '<w:pPr><w:spacing w:after="120"/></w:pPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/>'
+        '<w:basedOn w:val="Normal"/><w:next w:val="Normal"/>'
+        '<w:pPr><w:keepNext/><w:spacing w:before="480" w:after="240"/><w:outlineLvl w:val="0"/></w:pPr>'
+        '<w:rPr><w:b/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/>'
+        '<w:basedOn w:val="Normal"/><w:next w:val="Normal"/>'
+        '<w:pPr><w:keepNext/><w:spacing w:before="200" w:after="120"/><w:outlineLvl w:val="1"/></w:pPr>'
+        '<w:rPr><w:b/><w:sz w:val="26"/><w:szCs w:val="26"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="ListNumber"><w:name w:val="List Number"/>'
+        '<w:basedOn w:val="Normal"/><w:pPr><w:ind w:left="720" w:hanging="360"/></w:pPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="ListBullet"><w:name w:val="List Bullet"/>'
+        '<w:basedOn w:val="Normal"/><w:pPr><w:ind w:left="720" w:hanging="360"/></w:pPr></w:style>'
+        '</w:styles>'
+    ).encode("utf-8"),
+}
+
+DOCUMENT_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+)
+DOCUMENT_FOOTER = (
+    '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+    '<w:pgMar w:top="1134" w:right="850" w:bottom="1134" w:left="1701" '
+    'w:header="708" w:footer="708" w:gutter="0"/></w:sectPr>'
+    '</w:body></w:document>'
+)
+
+# Символы, недопустимые в XML 1.0: Word и python-docx не открывают документ с ними
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+_PARAGRAPH = '<w:p><w:pPr>{props}</w:pPr><w:r>{run_props}<w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def paragraph(text, style=None, center=False, bold=False):
+    """XML-фрагмент абзаца с экранированным текстом"""
+    props = f'<w:pStyle w:val="{style}"/>' if style else ""
+    if center:
+        props += '<w:jc w:val="center"/>'
+    run_props = "<w:rPr><w:b/></w:rPr>" if bold else ""
+    return _PARAGRAPH.format(props=props, run_props=run_props, text=escape(_INVALID_XML_CHARS.sub("", text)))
+
+
+def heading(text, level, center=False):
+    return paragraph(text, style=f"Heading{level}", center=center)
+
+
+def build_docx(body_xml):
+    """Собирает DOCX-пакет из тела документа и статических частей"""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for name, blob in STATIC_PARTS.items():
+            zf.writestr(name, blob)
+        zf.writestr("word/document.xml", DOCUMENT_HEADER + body_xml + DOCUMENT_FOOTER)
+    buffer.seek(0)
+    return buffer
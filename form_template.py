@@ -0,0 +1,182 @@
+# HTML-шаблон веб-формы расчёта (Jinja2)
+FORM_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Расчёт уровня существенности</title>
+    <style>
+        body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
+        .timer { color: red; font-weight: bold; }
+        form { margin-top: 20px; }
+        .indicator { margin-bottom: 15px; display: flex; gap: 10px; align-items: center; }
+        button { margin-top: 20px; padding: 10px 20px; }
+        .result { margin-top: 20px; padding: 15px; background: #f5f5f5; border-radius: 5px; }
+    </style>
+</head>
+<body>
+    <h1>Калькулятор уровня существенности</h1>
+    <p>Осталось времени: <span class="timer" id="timer">10:00</span></p>
+    
+    <form id="calculationForm">
+        <div id="indicatorsContainer">
+            <div class="indicator">
+                <label>Показатель 1:</label>
+                <input type="text" name="name_1" placeholder="Название" required>
+                <input type="number" name="value_1" placeholder="Значение" min="0" step="1000" required>
+            </div>
+        </div>
+        
+        <button type="button" onclick="addIndicator()">+ Добавить показатель</button>
+        
+        <div style="margin-top: 20px;">
+            <label>Допустимое отклонение (%):</label>
+            <input type="number" name="deviation_threshold" value="50" min="0" max="100" required>
+        </div>
+        
+        <div>
+            <label>Макс. отклонение при округлении:</label>
+            <input type="number" name="rounding_limit" value="50" min="0" required>
+        </div>
+        
+        <div>
+            <label>
+                <input type="checkbox" name="with_docx">
+                Сгенерировать Word-отчёт
+            </label>
+        </div>
+        
+        <button type="submit">Рассчитать</button>
+    </form>
+    
+    <div id="result" class="result"></div>
+    
+    <script>
+        // Таймер
+        const expiresAt = {{ expires_at }};
+        function updateTimer() {
+            const now = Math.floor(Date.now() / 1000);
+            const remaining = expiresAt - now;
+            
+            if (remaining <= 0) {
+                document.getElementById('timer').textContent = "00:00";
+                alert("Время сессии истекло!");
+                return;
+            }
+            
+            const minutes = Math.floor(remaining / 60);
+            const seconds = remaining % 60;
+            document.getElementById('timer').textContent = 
+                `${minutes.toString().padStart(2, '0')}:${seconds.toString().padStart(2, '0')}`;
+            
+            setTimeout(updateTimer, 1000);
+        }
+        
+        updateTimer();
+        
+        // Добавление показателей
+        let indicatorCount = 1;
+        function addIndicator() {
+            indicatorCount++;
+            if (indicatorCount > 50) {
+                alert("Максимум 50 показателей");
+                return;
+            }
+            
+            const container = document.getElementById('indicatorsContainer');
+            const newIndicator = document.createElement('div');
+            newIndicator.className = 'indicator';
+            newIndicator.innerHTML = `
+                <label>Показатель ${indicatorCount}:</label>
+                <input type="text" name="name_${indicatorCount}" placeholder="Название" required>
+                <input type="number" name="value_${indicatorCount}" placeholder="Значение" min="0" step="1000" required>
+            `;
+            container.appendChild(newIndicator);
+        }
+        
+        // Отправка формы
+        document.getElementById('calculationForm').addEventListener('submit', async function(e) {
+            e.preventDefault();
+            
+            const formData = new FormData(this);
+            const indicators = [];
+            
+            for (let i = 1; i <= indicatorCount; i++) {
+                const name = formData.get(`name_${i}`);
+                const value = parseFloat(formData.get(`value_${i}`));
+                
+                if (name && !isNaN(value)) {
+                    indicators.push({ name, value });
+                }
+            }
+            
+            const requestData = {
+                indicators,
+                deviation_threshold: parseFloat(formData.get('deviation_threshold')),
+                rounding_limit: parseFloat(formData.get('rounding_limit')),
+                with_docx: formData.get('with_docx') === 'on'
+            };
+            
+            try {
+                const response = await fetch('/api/v1/calculate', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(requestData)
+                });
+                
+                if (requestData.with_docx && response.ok) {
+                    // Скачивание Word-документа
+                    const blob = await response.blob();
+                    const url = window.URL.createObjectURL(blob);
+                    const a = document.createElement('a');
+                    a.href = url;
+                    a.download = 'materiality_report.docx';
+                    document.body.appendChild(a);
+                    a.click();
+                    document.body.removeChild(a);
+                } else {
+                    // Отображение JSON-результата
+                    const result = await response.json();
+                    displayResult(result);
+                }
+            } catch (error) {
+                document.getElementById('result').innerHTML = 
+                    `<p style="color: red;">Ошибка: ${error.message}</p>`;
+            }
+        });
+        
+        function displayResult(result) {
+            let html = '<h2>Результаты расчёта</h2>';
+            
+            html += '<h3>Исходные показатели:</h3><ul>';
+            result.indicators.forEach(ind => {
+                html += `<li>${ind.name}: ${ind.value.toLocaleString()} руб.</li>`;
+            });
+            html += '</ul>';
+            
+            html += '<h3>Процесс расчёта:</h3>';
+            html += `<p>Среднее арифметическое: <b>${result.calculation_steps.initial_mean.toLocaleString()} руб.</b></p>`;
+            
+            if (result.calculation_steps.excluded_count > 0) {
+                html += `<p>Исключено показателей: ${result.calculation_steps.excluded_count}</p>`;
+                html += '<p>Исключённые значения: ' + 
+                    result.calculation_steps.excluded_values.map(v => v.toLocaleString() + ' руб.').join(', ') + '</p>';
+            }
+            
+            html += `<p>Среднее после исключения: <b>${result.calculation_steps.filtered_mean.toLocaleString()} руб.</b></p>`;
+            html += `<p>Округлённое значение: <b>${result.calculation_steps.rounded_value.toLocaleString()} руб.</b></p>`;
+            
+            html += '<h3>Отклонения показателей:</h3><ul>';
+            result.calculation_steps.indicators.forEach(ind => {
+                html += `<li>${ind.name}: ${ind.value.toLocaleString()} руб. ` +
+                        `(отклонение: ${ind.deviation.percent.toFixed(2)}%)</li>`;
+            });
+            html += '</ul>';
+            
+            html += `<h2 style="color: green;">Итоговый уровень существенности: ${result.materiality_level.toLocaleString()} руб.</h2>`;
+            
+            document.getElementById('result').innerHTML = html;
+        }
+    </script>
+</body>
+</html>
+"""
@@ -0,0 +1,37 @@
+import numpy as np
+from numba import njit
+
+
+# Вычислительное ядро расчёта существенности.
+# Явная сигнатура компилирует функцию сразу при импорте модуля, а cache=True
+# сохраняет машинный код на диск, поэтому первый запрос не платит за JIT.
+# fastmath не используется: маска — точное сравнение с порогом, и любая перестановка
+# операций (например, умножение на обратное к среднему) меняет результат на границе.
+# error_model="numpy": деление на нулевое среднее даёт inf/nan, как в NumPy.
+@njit("Tuple((f8,f8,f8,b1[:],f8[:]))(f8[:],f8,f8)", cache=True, nogil=True, error_model="numpy")
+def materiality_core(values, threshold, rounding_limit):
+    """Возвращает (округлённое значение, среднее, новое среднее, маска оставленных, отклонения в %)"""
+    n = values.shape[0]
+    total = 0.0
+    for i in range(n):
+        total += values[i]
+    mean = total / n
+
+    pct = np.empty(n, dtype=np.float64)
+    mask = np.empty(n, dtype=np.bool_)
+    filtered_sum = 0.0
+    filtered_count = 0
+    for i in range(n):
+        pct[i] = (values[i] - mean) / mean * 100.0
+        keep = abs(values[i] - mean) / mean * 100.0 <= threshold
+        mask[i] = keep
+        if keep:
+            filtered_sum += values[i]
+            filtered_count += 1
+
+    new_mean = filtered_sum / filtered_count if filtered_count else mean
+    rounded = round(new_mean / 100.0) * 100.0
+    if abs(rounded - new_mean) > rounding_limit:
+        rounded = new_mean
+
+    return rounded, mean, new_mean, mask, pct
@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+
+def test_calculate_returns_null_for_overflowing_deviation():
+    response = client.post(
+        "/api/v1/calculate",
+        json={
+            "indicators": [
+                {"name": f"Показатель {i}", "value": value}
+                for i, value in enumerate([1e10, -1e10, 1e-300, 1e-300, 1e-300, 1e-300], 1)
+            ],
+            "deviation_threshold": 100,
+            "rounding_limit": 50
+        }
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    percents = [indicator["deviation"]["percent"] for indicator in body["calculation_steps"]["indicators"]]
+    assert percents[0] is None and percents[1] is None
+    assert body["calculation_steps"]["excluded_count"] == 2
@@ -0,0 +1,14 @@
+import zipfile
+from xml.etree import ElementTree
+
+from docx_template import build_docx, paragraph
+
+
+def test_paragraph_drops_invalid_xml_chars():
+    buffer = build_docx(paragraph("a\u0001b\u000b<&>\ud800c\ttab"))
+
+    with zipfile.ZipFile(buffer) as zf:
+        root = ElementTree.fromstring(zf.read("word/document.xml"))
+
+    texts = [t.text for t in root.iter("{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t")]
+    assert texts == ["ab<&>c\ttab"]
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from materiality_kernel import materiality_core
+
+
+def reference(values, threshold, rounding_limit):
+    """Векторизованный расчёт на NumPy, с которым должно совпадать ядро"""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        mean = values.mean()
+        pct = (values - mean) / mean * 100.0
+        mask = np.abs(values - mean) / mean * 100.0 <= threshold
+        if not mask.any():
+            return None, mean, mask, pct
+        new_mean = values[mask].mean()
+    rounded = round(new_mean / 100) * 100
+    if abs(rounded - new_mean) > rounding_limit:
+        rounded = new_mean
+    return rounded, mean, mask, pct
+
+
+@pytest.mark.parametrize("values", [
+    [1800000, 1374000, 480000, 480000, 668000, 100000, 208000],
+    [1000, 2000],
+    [857142.0],
+    [-100, -200, -1000],
+    [0, 0],
+    [1, -1],
+    [1e308, 1e308],
+    [float("inf"), 1],
+    [float("nan"), 1],
+])
+@pytest.mark.parametrize("threshold", [0.0, 50.0, 100.0])
+def test_kernel_matches_numpy(values, threshold):
+    values = np.array(values, dtype=np.float64)
+    expected_rounded, expected_mean, expected_mask, expected_pct = reference(values, threshold, 50.0)
+
+    rounded, mean, new_mean, mask, pct = materiality_core(values, threshold, 50.0)
+
+    np.testing.assert_array_equal(mask, expected_mask)
+    np.testing.assert_allclose(pct, expected_pct, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(mean, expected_mean, rtol=1e-12, equal_nan=True)
+    if expected_rounded is not None:
+        assert rounded == pytest.approx(expected_rounded, rel=1e-12)
+
+
+@pytest.mark.parametrize("values, threshold", [
+    ([42000, 14000], 50.0),
+    ([800, 1000, 1800], 50.0),
+    ([100, 300], 50.0),
+    ([1000, 3000, 2000], 50.0),
+])
+def test_kernel_keeps_deviation_equal_to_threshold(values, threshold):
+    values = np.array(values, dtype=np.float64)
+    _, _, expected_mask, _ = reference(values, threshold, 50.0)
+
+    mask = materiality_core(values, threshold, 50.0)[3]
+
+    np.testing.assert_array_equal(mask, expected_mask)
+    assert mask.all()